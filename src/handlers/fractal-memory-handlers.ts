@@ -446,26 +446,35 @@ export const checkContinuityHandler: ToolDefinition = {
 				};
 			}
 
-			let text = `Character Continuity Report: ${characterName}\n\n`;
+			// Collect report lines and join once; long character histories would
+			// otherwise grow the string once per appearance
+			const lines = [`Character Continuity Report: ${characterName}`, ''];
 
 			// Show appearances
-			text += 'Appearances by chapter:\n';
-			continuity.continuity.forEach((app: ContinuityItem) => {
-				text +=
+			lines.push('Appearances by chapter:');
+			for (const app of continuity.continuity as ContinuityItem[]) {
+				lines.push(
 					`- ${app.chapter_id} (${app.scale}): ${app.appearance_count} times, ` +
-					`sequences ${app.first_appearance_seq}-${app.last_appearance_seq}\n`;
-			});
+						`sequences ${app.first_appearance_seq}-${app.last_appearance_seq}`
+				);
+			}
+			lines.push('');
 
 			// Show gaps
 			if (continuity.gaps && continuity.gaps.length > 0) {
-				text += '\nContinuity gaps detected:\n';
-				continuity.gaps.forEach((gap: ContinuityGap) => {
-					text += `- Gap of ${gap.gapSize} sequences between ${gap.from.chapter_id} and ${gap.to.chapter_id}\n`;
-				});
+				lines.push('Continuity gaps detected:');
+				for (const gap of continuity.gaps as ContinuityGap[]) {
+					lines.push(
+						`- Gap of ${gap.gapSize} sequences between ${gap.from.chapter_id} and ${gap.to.chapter_id}`
+					);
+				}
+				lines.push('');
 			} else {
-				text += '\nNo continuity gaps detected.';
+				lines.push('No continuity gaps detected.');
 			}
 
+			const text = lines.join('\n');
+
 			return {
 				content: [
 					{
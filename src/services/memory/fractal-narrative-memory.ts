@@ -7,7 +7,11 @@
 import { EventEmitter } from 'events';
 import Database from 'better-sqlite3';
 import nlp from 'compromise';
-import { HolographicMemorySystem } from './hhm/holographic-memory-system.js';
+import {
+	HolographicMemorySystem,
+	topK,
+	type QueryResult,
+} from './hhm/holographic-memory-system.js';
 import { getLogger } from '../../core/logger.js';
 // import { AppError, ErrorCode } from '../../utils/common.js';
 import type { ScrivenerDocument } from '../../types/index.js';
@@ -70,6 +74,12 @@ export interface GraphEdge {
 	evidenceJson: Record<string, any>;
 }
 
+export interface EntityMention {
+	name: string;
+	type: 'character' | 'setting';
+	startChar: number;
+}
+
 export interface MotifCluster {
 	clusterId: number;
 	keywords: string[];
@@ -107,6 +117,68 @@ export interface FractalMemoryConfig {
 // Fractal Segmentation Engine
 // ============================================================================
 
+// Explicit scene markers, fused so the chapter is scanned once
+const SCENE_BREAK_PATTERN = new RegExp(
+	[
+		'\\n\\n\\*\\*\\*\\n\\n', // asterisk breaks
+		'\\n\\n---\\n\\n', // dash breaks
+		'\\n\\n\\s*\\n\\n', // multiple blank lines
+		'Chapter \\d+', // chapter markers
+	].join('|'),
+	'gi'
+);
+
+/**
+ * Index of the first element in an ascending array that is >= value
+ */
+function lowerBound(sorted: ArrayLike<number>, value: number): number {
+	let lo = 0;
+	let hi = sorted.length;
+	while (lo < hi) {
+		const mid = (lo + hi) >>> 1;
+		if (sorted[mid] < value) {
+			lo = mid + 1;
+		} else {
+			hi = mid;
+		}
+	}
+	return lo;
+}
+
+// Scene and arc heuristics, compiled once instead of on every segment
+const ACTION_WORDS =
+	/\b(ran|jumped|fought|grabbed|threw|suddenly|clashed|sprinted|gasped|shouted)\b/gi;
+const SENSORY_WORDS = /\b(smelled|tasted|saw|heard|felt|cold|warm|bright|dark|shadowy|scented)\b/gi;
+const RESOLUTION_CUES = /finally|conclusion|resolved/i;
+const CLIMAX_CUES = /climax|confrontation|battle/i;
+const SETUP_CUES = /once upon a time|introduced|began/i;
+
+/**
+ * Count matches of a global pattern without materializing a match array
+ */
+function countMatches(text: string, pattern: RegExp): number {
+	pattern.lastIndex = 0;
+	let count = 0;
+	while (pattern.exec(text) !== null) {
+		count++;
+	}
+	return count;
+}
+
+/**
+ * Count dialogue quote characters: " ' « » „
+ */
+function countQuotes(text: string): number {
+	let count = 0;
+	for (let i = 0; i < text.length; i++) {
+		const c = text.charCodeAt(i);
+		if (c === 0x22 || c === 0x27 || c === 0xab || c === 0xbb || c === 0x201e) {
+			count++;
+		}
+	}
+	return count;
+}
+
 export class FractalSegmenter {
 	private logger: ReturnType<typeof getLogger>;
 	// private sentenceTokenizer: unknown; // spaCy or similar
@@ -124,11 +196,15 @@ export class FractalSegmenter {
 		micro: MicroSegment[];
 		meso: MesoSegment[];
 		macro: MacroSegment[];
+		mentions: EntityMention[];
 	}> {
 		this.logger.debug(`Segmenting chapter ${chapterIndex}`);
 
+		// Parse the chapter once; sentence splitting and entity extraction share the pass
+		const doc = nlp(chapterText);
+
 		// 1. Create micro segments (sentences/beats)
-		const microSegments = await this.createMicroSegments(chapterText, chapterIndex);
+		const microSegments = await this.createMicroSegments(doc, chapterText, chapterIndex);
 
 		// 2. Create meso segments (scenes/blocks)
 		const mesoSegments = await this.createMesoSegments(
@@ -144,16 +220,23 @@ export class FractalSegmenter {
 			micro: microSegments,
 			meso: mesoSegments,
 			macro: [macroSegment],
+			mentions: this.extractMentions(doc),
 		};
 	}
 
-	private async createMicroSegments(text: string, chapterIndex: number): Promise<MicroSegment[]> {
-		const sentences = await this.splitIntoSentences(text);
+	private async createMicroSegments(
+		doc: ReturnType<typeof nlp>,
+		text: string,
+		chapterIndex: number
+	): Promise<MicroSegment[]> {
+		const sentences = await this.splitIntoSentences(doc, text);
+		const paragraphEnds = this.findParagraphEnds(text);
 		const microSegments: MicroSegment[] = [];
 
 		for (let i = 0; i < sentences.length; i++) {
 			const sent = sentences[i];
 			const beats = this.splitLongSentence(sent);
+			const paraIndex = this.getParagraphIndex(sent.startChar, paragraphEnds);
 
 			for (let j = 0; j < beats.length; j++) {
 				const beat = beats[j];
@@ -162,7 +245,7 @@ export class FractalSegmenter {
 					microSegments.push({
 						id: `micro_${chapterIndex}_${i}_${j}`,
 						chapter: chapterIndex,
-						paraIndex: this.getParagraphIndex(sent.startChar, text),
+						paraIndex,
 						sentIndex: i,
 						beatIndex: beats.length > 1 ? j : undefined,
 						text: beat,
@@ -175,7 +258,7 @@ export class FractalSegmenter {
 					microSegments.push({
 						id: `micro_${chapterIndex}_${i}_${j}`,
 						chapter: chapterIndex,
-						paraIndex: this.getParagraphIndex(sent.startChar, text),
+						paraIndex,
 						sentIndex: i,
 						beatIndex: beats.length > 1 ? j : undefined,
 						text: (beat as { text: string; startChar: number; endChar: number }).text,
@@ -213,22 +296,15 @@ export class FractalSegmenter {
 	private detectSceneBreaks(text: string): number[] {
 		const breaks: number[] = [0];
 
-		// Look for explicit scene markers
-		const sceneMarkers = [
-			/\n\n\*\*\*\n\n/g, // asterisk breaks
-			/\n\n---\n\n/g, // dash breaks
-			/\n\n\s*\n\n/g, // multiple blank lines
-			/Chapter \d+/gi, // chapter markers
-		];
-
-		for (const marker of sceneMarkers) {
-			let match;
-			while ((match = marker.exec(text)) !== null) {
+		// One scan finds every marker, already in ascending order
+		for (const match of text.matchAll(SCENE_BREAK_PATTERN)) {
+			// Offset 0 is already the first break
+			if (match.index) {
 				breaks.push(match.index);
 			}
 		}
 
-		return [...new Set(breaks)].sort((a, b) => a - b);
+		return breaks;
 	}
 
 	private createMacroSegment(
@@ -280,16 +356,27 @@ export class FractalSegmenter {
 		return text.split(/\s+/).length;
 	}
 
-	private getParagraphIndex(charPos: number, text: string): number {
-		const beforeText = text.substring(0, charPos);
-		return (beforeText.match(/\n\n/g) || []).length;
+	/**
+	 * End offsets of every paragraph break, found in one pass over the chapter
+	 */
+	private findParagraphEnds(text: string): Int32Array {
+		const ends: number[] = [];
+		for (let pos = text.indexOf('\n\n'); pos !== -1; pos = text.indexOf('\n\n', pos + 2)) {
+			ends.push(pos + 2);
+		}
+		return Int32Array.from(ends);
+	}
+
+	// Number of paragraph breaks that end at or before charPos
+	private getParagraphIndex(charPos: number, paragraphEnds: Int32Array): number {
+		return lowerBound(paragraphEnds, charPos + 1);
 	}
 
 	private async splitIntoSentences(
+		doc: ReturnType<typeof nlp>,
 		text: string
 	): Promise<Array<{ text: string; startChar: number; endChar: number }>> {
 		// Production-ready sentence splitting using NLP
-		const doc = nlp(text);
 		const sentences = doc.sentences().json();
 		let currentPos = 0;
 
@@ -304,6 +391,27 @@ export class FractalSegmenter {
 		});
 	}
 
+	/**
+	 * Collect people and places from the chapter parse, ordered by position,
+	 * so the graph can attribute them to meso segments without re-parsing
+	 */
+	private extractMentions(doc: ReturnType<typeof nlp>): EntityMention[] {
+		const mentions: EntityMention[] = [];
+		const collect = (matches: any[], type: EntityMention['type']) => {
+			for (const match of matches) {
+				const startChar = match.offset?.start;
+				if (typeof startChar === 'number') {
+					mentions.push({ name: match.text, type, startChar });
+				}
+			}
+		};
+
+		collect(doc.people().json({ offset: true }), 'character');
+		collect(doc.places().json({ offset: true }), 'setting');
+
+		return mentions.sort((a, b) => a.startChar - b.startChar);
+	}
+
 	private createSlidingWindows(
 		text: string,
 		chapterIndex: number,
@@ -368,13 +476,19 @@ export class FractalSegmenter {
 		// Sort breaks and add end of text
 		const sortedBreaks = [...new Set(sceneBreaks)].sort((a, b) => a - b);
 
+		// Order micro segments by start offset once so each scene's members are
+		// located by binary search rather than a scan over every segment
+		const orderedMicros = [...microSegments].sort((a, b) => a.startChar - b.startChar);
+		const microStarts = Int32Array.from(orderedMicros, (m) => m.startChar);
+
 		for (let i = 0; i < sortedBreaks.length; i++) {
 			const start = sortedBreaks[i];
 			const end = i < sortedBreaks.length - 1 ? sortedBreaks[i + 1] : text.length;
 
 			// Find micro segments that fall within this range
-			const sceneMicros = microSegments.filter(
-				(m) => m.startChar >= start && m.startChar < end
+			const sceneMicros = orderedMicros.slice(
+				lowerBound(microStarts, start),
+				lowerBound(microStarts, end)
 			);
 
 			if (sceneMicros.length > 0) {
@@ -396,42 +510,24 @@ export class FractalSegmenter {
 	}
 
 	private detectSceneType(text: string): 'action' | 'dialogue' | 'description' | 'transition' {
-		// Enhanced heuristics for scene type detection
-		const dialogueMatch = text.match(/["'«»„""]/g) || [];
-		const dialogueRatio = dialogueMatch.length / (text.length / 50); // Normalize by avg word length
-
-		const actionWords = (
-			text.match(
-				/\b(ran|jumped|fought|grabbed|threw|suddenly|clashed|sprinted|gasped|shouted)\b/gi
-			) || []
-		).length;
-		const actionDensity = actionWords / (text.length / 500);
-
-		const sensoryWords = (
-			text.match(
-				/\b(smelled|tasted|saw|heard|felt|cold|warm|bright|dark|shadowy|scented)\b/gi
-			) || []
-		).length;
-
+		// Enhanced heuristics for scene type detection (normalized by avg word length)
+		const dialogueRatio = countQuotes(text) / (text.length / 50);
 		if (dialogueRatio > 0.8) return 'dialogue';
+
+		const actionDensity = countMatches(text, ACTION_WORDS) / (text.length / 500);
 		if (actionDensity > 1.5) return 'action';
-		if (text.length < 300 && sensoryWords < 2) return 'transition';
+
+		// Sensory words only matter for short segments
+		if (text.length < 300 && countMatches(text, SENSORY_WORDS) < 2) return 'transition';
 		return 'description';
 	}
 
 	private detectArcType(text: string): 'setup' | 'rising' | 'climax' | 'falling' | 'resolution' {
-		// Use structural patterns to detect arc type
-		const lower = text.toLowerCase();
-		if (lower.includes('finally') || lower.includes('conclusion') || lower.includes('resolved'))
-			return 'resolution';
-		if (lower.includes('climax') || lower.includes('confrontation') || lower.includes('battle'))
-			return 'climax';
-		if (
-			lower.includes('once upon a time') ||
-			lower.includes('introduced') ||
-			lower.includes('began')
-		)
-			return 'setup';
+		// Use structural patterns to detect arc type; case-insensitive patterns
+		// avoid lowercasing a copy of the whole chapter
+		if (RESOLUTION_CUES.test(text)) return 'resolution';
+		if (CLIMAX_CUES.test(text)) return 'climax';
+		if (SETUP_CUES.test(text)) return 'setup';
 		return 'rising';
 	}
 }
@@ -440,15 +536,150 @@ export class FractalSegmenter {
 // Fractal Retrieval Engine
 // ============================================================================
 
+type SegmentScale = 'micro' | 'meso' | 'macro';
+
+type ContinuityRow = [
+	canonicalName: string,
+	state1: string,
+	state2: string,
+	evidenceJson: string | null,
+];
+
+// Hot-path graph reads fetch tuple rows, skipping per-row object construction
+type SegmentNodeRow = [segmentId: string, centrality: number | null, canonicalName: string];
+
+function scaleOf(segmentId: string): SegmentScale {
+	return segmentId.startsWith('micro_')
+		? 'micro'
+		: segmentId.startsWith('meso_')
+			? 'meso'
+			: 'macro';
+}
+
+type AnySegment = MicroSegment | MesoSegment | MacroSegment;
+
+interface SegmentCodec<T extends AnySegment> {
+	columns: string;
+	toTuple(segment: T): unknown[];
+	fromTuple(row: any[]): T;
+}
+
+/**
+ * Column layout of each segments_<scale> table. Rows are written and read as
+ * positional tuples in this order, so no keyed row objects are built.
+ */
+const SEGMENT_CODECS: {
+	micro: SegmentCodec<MicroSegment>;
+	meso: SegmentCodec<MesoSegment>;
+	macro: SegmentCodec<MacroSegment>;
+} = {
+	micro: {
+		columns:
+			'id, chapter, para_index, sent_index, beat_index, text, start_char, end_char, tokens',
+		toTuple: (s) => [
+			s.id,
+			s.chapter,
+			s.paraIndex,
+			s.sentIndex,
+			s.beatIndex || null,
+			s.text,
+			s.startChar,
+			s.endChar,
+			s.tokens,
+		],
+		fromTuple: ([
+			id,
+			chapter,
+			paraIndex,
+			sentIndex,
+			beatIndex,
+			text,
+			startChar,
+			endChar,
+			tokens,
+		]) => ({
+			id,
+			chapter,
+			paraIndex,
+			sentIndex,
+			beatIndex: beatIndex ?? undefined,
+			text,
+			startChar,
+			endChar,
+			tokens,
+		}),
+	},
+	meso: {
+		columns: 'id, chapter, start_char, end_char, text, micro_ids, scene_type, tokens',
+		toTuple: (s) => [
+			s.id,
+			s.chapter,
+			s.startChar,
+			s.endChar,
+			s.text,
+			JSON.stringify(s.microIds),
+			s.sceneType,
+			s.tokens,
+		],
+		fromTuple: ([id, chapter, startChar, endChar, text, microIds, sceneType, tokens]) => ({
+			id,
+			chapter,
+			startChar,
+			endChar,
+			text,
+			microIds: JSON.parse(microIds || '[]'),
+			sceneType: sceneType ?? undefined,
+			tokens,
+		}),
+	},
+	macro: {
+		columns: 'id, chapter_or_arc, start_char, end_char, text, meso_ids, arc_type',
+		toTuple: (s) => [
+			s.id,
+			s.chapterOrArc,
+			s.startChar,
+			s.endChar,
+			s.text,
+			JSON.stringify(s.mesoIds),
+			s.arcType,
+		],
+		fromTuple: ([id, chapterOrArc, startChar, endChar, text, mesoIds, arcType]) => ({
+			id,
+			chapterOrArc,
+			startChar,
+			endChar,
+			text,
+			mesoIds: JSON.parse(mesoIds || '[]'),
+			arcType: arcType ?? undefined,
+		}),
+	},
+};
+
+function segmentCodec(scale: SegmentScale): SegmentCodec<AnySegment> {
+	return SEGMENT_CODECS[scale] as SegmentCodec<AnySegment>;
+}
+
+function segmentInsertSql(scale: SegmentScale): string {
+	const { columns } = SEGMENT_CODECS[scale];
+	const params = columns.split(', ').map(() => '?');
+	return `INSERT OR REPLACE INTO segments_${scale} (${columns}) VALUES (${params.join(', ')})`;
+}
+
+const SEGMENT_INSERT_SQL: Record<SegmentScale, string> = {
+	micro: segmentInsertSql('micro'),
+	meso: segmentInsertSql('meso'),
+	macro: segmentInsertSql('macro'),
+};
+
 export class FractalRetriever {
 	private logger: ReturnType<typeof getLogger>;
 	private hms: HolographicMemorySystem;
 	private config: FractalMemoryConfig;
 
-	constructor(config: FractalMemoryConfig) {
+	constructor(config: FractalMemoryConfig, hms?: HolographicMemorySystem) {
 		this.logger = getLogger('FractalRetriever');
 		this.config = config;
-		this.hms = new HolographicMemorySystem();
+		this.hms = hms || new HolographicMemorySystem();
 	}
 
 	async initialize() {
@@ -457,6 +688,10 @@ export class FractalRetriever {
 	}
 
 	async memorizeBatch(items: Array<{ id: string; text: string }>): Promise<void> {
+		if (items.length === 0) return;
+
+		// One call for the whole list: the JS engine rebuilds IDF over the full
+		// corpus per batch, so splitting it would repeat that rebuild per chunk
 		await this.hms.memorizeBatch(items);
 	}
 
@@ -464,30 +699,66 @@ export class FractalRetriever {
 		query: string,
 		k: number = 10,
 		scaleWeights?: Partial<typeof this.config.scaleWeights>,
-		graphDB?: Database.Database
+		graphDB?: Database.Database,
+		segmentDB?: Database.Database
 	): Promise<FractalRetrievalResult[]> {
+		const [results] = await this.retrieveBatch([query], k, scaleWeights, graphDB, segmentDB);
+		return results;
+	}
+
+	/**
+	 * Retrieve for several queries at once: one HMS batch search, then one
+	 * segment and graph lookup over the union of every query's hits
+	 */
+	async retrieveBatch(
+		queries: string[],
+		k: number = 10,
+		scaleWeights?: Partial<typeof this.config.scaleWeights>,
+		graphDB?: Database.Database,
+		segmentDB?: Database.Database
+	): Promise<FractalRetrievalResult[][]> {
+		if (queries.length === 0) return [];
 		const weights = { ...this.config.scaleWeights, ...scaleWeights };
 
 		// Use HMS for native semantic query
-		const hmsResults = await this.hms.queryText(query, k * 2);
+		const hmsBatch = await this.hms.queryTextBatch(queries, k * 2);
+		const hitIds = [...new Set(hmsBatch.flatMap((hits) => hits.map((r) => r.id)))];
+
+		// Fetch all hit segments in one lookup per scale
+		const stored = segmentDB ? this.loadSegments(hitIds, segmentDB) : new Map<string, any>();
 
+		// Graph nodes for every hit in one round trip
+		const segmentNodes = graphDB ? this.loadSegmentNodes(hitIds, graphDB) : null;
+
+		return hmsBatch.map((hits, i) =>
+			this.scoreHits(hits, queries[i].toLowerCase(), k, weights, stored, segmentNodes)
+		);
+	}
+
+	private scoreHits(
+		hmsResults: QueryResult[],
+		queryLower: string,
+		k: number,
+		weights: typeof this.config.scaleWeights,
+		stored: Map<string, any>,
+		segmentNodes: Map<string, SegmentNodeRow[]> | null
+	): FractalRetrievalResult[] {
 		const results: FractalRetrievalResult[] = [];
 
 		for (const r of hmsResults) {
 			const segmentId = r.id;
-			const scale = segmentId.startsWith('micro_')
-				? 'micro'
-				: segmentId.startsWith('meso_')
-					? 'meso'
-					: 'macro';
+			const scale = scaleOf(segmentId);
 
 			const weight = weights[scale as keyof typeof weights] || 1.0;
-			const segment =
-				(r.entry.metadata?.originalData as any) ||
-				(await this.loadSegment(segmentId, scale));
+			const segment = stored.get(segmentId) || {
+				id: segmentId,
+				text: r.entry.metadata?.originalData,
+			};
 
 			const similarity = r.similarity;
-			const graphBoost = graphDB ? await this.computeGraphBoost(segment, query, graphDB) : 0;
+			const graphBoost = segmentNodes
+				? this.computeGraphBoost(segmentNodes.get(segmentId) || [], queryLower)
+				: 0;
 			const contextBoost = this.computeContextBoost(segment);
 
 			const score =
@@ -505,8 +776,8 @@ export class FractalRetriever {
 			});
 		}
 
-		// Sort by score and return top k
-		return results.sort((a, b) => b.score - a.score).slice(0, k);
+		// Keep the top k by score without sorting every hit
+		return topK(results, k, (r) => r.score).map(({ item }) => item);
 	}
 
 	private async embed(_text: string): Promise<Float32Array> {
@@ -518,43 +789,57 @@ export class FractalRetriever {
 		return null;
 	}
 
-	private async computeGraphBoost(
-		segment: Record<string, unknown>,
-		query: string,
+	/**
+	 * Identify the graph nodes of every hit segment with a single query
+	 */
+	private loadSegmentNodes(
+		segmentIds: string[],
 		graphDB: Database.Database
-	): Promise<number> {
-		// Identify nodes in this segment from the map
-		const segmentId = String(segment.id);
+	): Map<string, SegmentNodeRow[]> {
+		const nodes = new Map<string, SegmentNodeRow[]>();
+		if (segmentIds.length === 0) return nodes;
 
 		try {
+			const placeholders = segmentIds.map(() => '?').join(', ');
 			const rows = graphDB
 				.prepare(
-					`SELECT n.centrality, n.canonical_name FROM nodes n 
-				 JOIN segment_node_map m ON n.node_id = m.node_id 
-				 WHERE m.segment_id = ?`
+					`SELECT m.segment_id, n.centrality, n.canonical_name FROM nodes n
+				 JOIN segment_node_map m ON n.node_id = m.node_id
+				 WHERE m.segment_id IN (${placeholders})`
 				)
-				.all(segmentId) as any[];
-
-			if (!rows || rows.length === 0) return 0;
-
-			// Calculate boost based on node centrality and query relevance
-			let boost = 0;
-			const queryLower = query.toLowerCase();
+				.raw()
+				.all(...segmentIds) as SegmentNodeRow[];
 
 			for (const row of rows) {
-				// Boost for central characters/themes
-				boost += Number(row.centrality || 0) * 0.1;
-
-				// Additional boost if query mentions this node
-				if (queryLower.includes(String(row.canonical_name).toLowerCase())) {
-					boost += 0.5;
+				const segmentId = row[0];
+				if (!nodes.has(segmentId)) {
+					nodes.set(segmentId, []);
 				}
+				nodes.get(segmentId)!.push(row);
 			}
-
-			return Math.min(boost, 1.0);
 		} catch (err) {
-			return 0;
+			// Boosts are optional; score on similarity alone
+		}
+		return nodes;
+	}
+
+	private computeGraphBoost(rows: SegmentNodeRow[], queryLower: string): number {
+		if (rows.length === 0) return 0;
+
+		// Calculate boost based on node centrality and query relevance
+		let boost = 0;
+
+		for (const [, centrality, canonicalName] of rows) {
+			// Boost for central characters/themes
+			boost += Number(centrality || 0) * 0.1;
+
+			// Additional boost if query mentions this node
+			if (queryLower.includes(String(canonicalName).toLowerCase())) {
+				boost += 0.5;
+			}
 		}
+
+		return Math.min(boost, 1.0);
 	}
 
 	private computeContextBoost(segment: Record<string, unknown>): number {
@@ -581,9 +866,35 @@ export class FractalRetriever {
 		return `${scale}_${label}`;
 	}
 
-	private async loadSegment(_segmentId: string, _scale: string): Promise<any> {
-		// Load segment from database
-		return {};
+	private loadSegments(
+		segmentIds: string[],
+		segmentDB: Database.Database
+	): Map<string, MicroSegment | MesoSegment | MacroSegment> {
+		const byScale = new Map<SegmentScale, string[]>();
+		for (const id of segmentIds) {
+			const scale = scaleOf(id);
+			if (!byScale.has(scale)) {
+				byScale.set(scale, []);
+			}
+			byScale.get(scale)!.push(id);
+		}
+
+		const segments = new Map<string, MicroSegment | MesoSegment | MacroSegment>();
+		for (const [scale, ids] of byScale) {
+			const codec = segmentCodec(scale);
+			const placeholders = ids.map(() => '?').join(', ');
+			const rows = segmentDB
+				.prepare(
+					`SELECT ${codec.columns} FROM segments_${scale} WHERE id IN (${placeholders})`
+				)
+				.raw()
+				.all(...ids) as any[][];
+			for (const row of rows) {
+				const segment = codec.fromTuple(row);
+				segments.set(segment.id, segment);
+			}
+		}
+		return segments;
 	}
 }
 
@@ -591,14 +902,88 @@ export class FractalRetriever {
 // Narrative Graph Manager
 // ============================================================================
 
+const MOTIF_THEMES = ['light', 'dark', 'water', 'fire', 'cold', 'warmth', 'silence', 'noise'];
+
+// All themes fused into one alternation so a segment is scanned once
+const MOTIF_PATTERN = new RegExp(MOTIF_THEMES.join('|'), 'gi');
+
+// Canonical names for known aliases, keyed by lowercased alias
+const NAME_ALIASES: ReadonlyMap<string, string> = new Map([
+	['tom', 'Thomas'],
+	['tommy', 'Thomas'],
+]);
+
+// Entity names repeat heavily across segments, so canonical names and node
+// ids are memoized per manager up to this many entries
+const NAME_CACHE_SIZE = 8192;
+
+function rememberBounded<V>(cache: Map<string, V>, key: string, value: V): V {
+	if (cache.size >= NAME_CACHE_SIZE) {
+		const oldest = cache.keys().next().value;
+		if (oldest !== undefined) {
+			cache.delete(oldest);
+		}
+	}
+	cache.set(key, value);
+	return value;
+}
+
+// Hot graph statements, compiled together when the manager opens its database
+const GRAPH_SQL = {
+	upsertNode: `INSERT INTO nodes (node_id, node_type, canonical_name, attributes_json)
+         VALUES (?, ?, ?, ?)
+         ON CONFLICT(node_id) DO UPDATE SET
+         frequency = frequency + 1`,
+	upsertMotifNode: `INSERT INTO nodes (node_id, node_type, canonical_name, attributes_json)
+         VALUES (?, 'motif', ?, ?)
+         ON CONFLICT(node_id) DO UPDATE SET
+         frequency = frequency + 1`,
+	upsertEdge: `INSERT INTO edges (edge_id, from_node, to_node, edge_type, evidence_json)
+         VALUES (?, ?, ?, ?, ?)
+         ON CONFLICT(edge_id) DO UPDATE SET
+         weight = weight + 1`,
+	linkSegmentToNode: `INSERT OR IGNORE INTO segment_node_map (segment_id, node_id, role)
+         VALUES (?, ?, ?)`,
+	// Degree centrality from a single scan of the edge table instead of a
+	// correlated subquery per node; self-loops count once, as before
+	nodeDegrees: `SELECT node_id, COUNT(*) AS degree FROM (
+           SELECT from_node AS node_id FROM edges
+           UNION ALL
+           SELECT to_node FROM edges WHERE to_node <> from_node
+         ) GROUP BY node_id`,
+	resetCentrality: `UPDATE nodes SET centrality = 0`,
+	updateCentrality: `UPDATE nodes SET centrality = ? WHERE node_id = ?`,
+	// Seeks the character through idx_nodes_canonical and its transitions
+	// through idx_edges_from, so a check touches only that character's rows
+	continuityRows: `SELECT n1.canonical_name, n1.attributes_json as state1,
+               n2.attributes_json as state2, e.evidence_json
+        FROM nodes n1
+        JOIN edges e ON n1.node_id = e.from_node
+        JOIN nodes n2 ON n2.node_id = e.to_node
+        WHERE n1.canonical_name = ?
+        AND n1.node_type = 'character'
+        AND e.edge_type = 'temporal'`,
+} as const;
+
 export class NarrativeGraphManager {
 	public db: Database.Database;
 	private logger: ReturnType<typeof getLogger>;
+	private statements: Map<string, Database.Statement> = new Map();
+	private canonicalNames: Map<string, string> = new Map();
+	private nodeIds: Map<string, Map<string, string>> = new Map();
 
 	constructor(dbPath: string) {
 		this.logger = getLogger('NarrativeGraphManager');
 		this.db = new Database(dbPath);
+		this.db.pragma('journal_mode = WAL');
+		this.db.pragma('synchronous = NORMAL');
+		this.db.pragma('temp_store = MEMORY');
 		this.initializeSchema();
+
+		// Compile up front so the first ingest or query does not pay for it
+		for (const sql of Object.values(GRAPH_SQL)) {
+			this.statement(sql);
+		}
 	}
 
 	private initializeSchema() {
@@ -641,44 +1026,87 @@ export class NarrativeGraphManager {
 		this.db.exec(`CREATE INDEX IF NOT EXISTS idx_edges_from ON edges(from_node)`);
 		this.db.exec(`CREATE INDEX IF NOT EXISTS idx_edges_to ON edges(to_node)`);
 		this.db.exec(`CREATE INDEX IF NOT EXISTS idx_segment_map ON segment_node_map(segment_id)`);
+		this.db.exec(`CREATE INDEX IF NOT EXISTS idx_nodes_canonical ON nodes(canonical_name)`);
 	}
 
 	async updateGraphForSegment(segment: MesoSegment): Promise<void> {
-		// 1. Extract entities using coreference resolution
-		const entities = await this.extractEntities(segment.text);
+		await this.updateGraphForSegments([segment]);
+	}
+
+	/**
+	 * Update the graph for a batch of segments and refresh centrality, all in
+	 * one synchronous transaction so concurrent callers cannot interleave.
+	 * When the chapter's entity mentions are supplied (from the segmenter's
+	 * parse), they are assigned to segments by offset instead of running NLP
+	 * on every segment again.
+	 */
+	async updateGraphForSegments(
+		segments: MesoSegment[],
+		mentions?: EntityMention[]
+	): Promise<void> {
+		const assigned = mentions ? this.assignMentions(segments, mentions) : null;
+
+		this.db.transaction(() => {
+			for (const segment of segments) {
+				// 1. Extract entities, reusing the chapter parse when available
+				const entities = assigned
+					? assigned.get(segment.id) || []
+					: this.extractEntities(segment.text);
+				this.writeSegmentGraph(segment, entities);
+			}
+			this.recomputeCentrality();
+		})();
+	}
+
+	private assignMentions(segments: MesoSegment[], mentions: EntityMention[]): Map<string, any[]> {
+		const mentionStarts = Int32Array.from(mentions, (m) => m.startChar);
+		const assigned = new Map<string, any[]>();
+
+		for (const segment of segments) {
+			const lo = lowerBound(mentionStarts, segment.startChar);
+			const hi = lowerBound(mentionStarts, segment.endChar);
+			assigned.set(
+				segment.id,
+				mentions.slice(lo, hi).map((m) => this.toEntity(m.name, m.type))
+			);
+		}
 
+		return assigned;
+	}
+
+	private writeSegmentGraph(segment: MesoSegment, entities: any[]): void {
 		// 2. Detect motifs
-		const motifs = await this.detectMotifs(segment.text);
+		const motifs = this.detectMotifs(segment.text);
 
 		// 3. Update nodes
 		const nodeIds: string[] = [];
 
 		for (const entity of entities) {
-			const nodeId = await this.upsertNode(entity);
+			const nodeId = this.upsertNode(entity);
 			nodeIds.push(nodeId);
-			await this.linkSegmentToNode(segment.id, nodeId, entity.role);
+			this.linkSegmentToNode(segment.id, nodeId, entity.role);
 		}
 
 		for (const motif of motifs) {
-			const nodeId = await this.upsertMotifNode(motif);
+			const nodeId = this.upsertMotifNode(motif);
 			nodeIds.push(nodeId);
-			await this.linkSegmentToNode(segment.id, nodeId, 'motif');
+			this.linkSegmentToNode(segment.id, nodeId, 'motif');
 		}
 
-		// 4. Create co-occurrence edges
-		for (let i = 0; i < nodeIds.length; i++) {
-			for (let j = i + 1; j < nodeIds.length; j++) {
-				await this.upsertEdge(nodeIds[i], nodeIds[j], 'cooccurrence', {
-					segment: segment.id,
-				});
+		// 4. Create co-occurrence edges, one per unordered pair of distinct nodes.
+		// Sorting makes the edge id independent of the order entities were found.
+		const pairNodes = [...new Set(nodeIds)].sort();
+		const evidence = JSON.stringify({ segment: segment.id });
+		for (let i = 0; i < pairNodes.length; i++) {
+			for (let j = i + 1; j < pairNodes.length; j++) {
+				this.upsertEdge(pairNodes[i], pairNodes[j], 'cooccurrence', evidence);
 			}
 		}
 
-		// 5. Update centrality metrics
-		await this.updateCentralityMetrics();
+		// Centrality is recomputed once per batch, after every segment is written
 	}
 
-	private async extractEntities(text: string): Promise<any[]> {
+	private extractEntities(text: string): any[] {
 		// Implementation using NLP for entity extraction
 		const doc = nlp(text);
 		const people = doc.people().out('array');
@@ -686,144 +1114,140 @@ export class NarrativeGraphManager {
 
 		const entities = [];
 		for (const name of people) {
-			entities.push({ name, type: 'character', attributes: { role: 'unknown' } });
+			entities.push(this.toEntity(name, 'character'));
 		}
 		for (const name of places) {
-			entities.push({ name, type: 'setting', attributes: { importance: 'unknown' } });
+			entities.push(this.toEntity(name, 'setting'));
 		}
 
 		return entities;
 	}
 
-	private async detectMotifs(text: string): Promise<any[]> {
-		// Look for recurring symbols and themes
-		const motifs = [];
-		const themes = ['light', 'dark', 'water', 'fire', 'cold', 'warmth', 'silence', 'noise'];
+	private toEntity(name: string, type: EntityMention['type']): any {
+		return type === 'character'
+			? { name, type, attributes: { role: 'unknown' } }
+			: { name, type, attributes: { importance: 'unknown' } };
+	}
 
-		const lower = text.toLowerCase();
-		for (const theme of themes) {
-			if (lower.includes(theme)) {
-				motifs.push({ label: theme, type: 'thematic' });
-			}
+	private detectMotifs(text: string): any[] {
+		// Look for recurring symbols and themes
+		const found = new Set<string>();
+		for (const match of text.matchAll(MOTIF_PATTERN)) {
+			found.add(match[0].toLowerCase());
+			if (found.size === MOTIF_THEMES.length) break;
 		}
 
-		return motifs;
+		return MOTIF_THEMES.filter((theme) => found.has(theme)).map((theme) => ({
+			label: theme,
+			type: 'thematic',
+		}));
+	}
+
+	/**
+	 * Prepared statements are compiled once and reused across every segment
+	 */
+	private statement(sql: string): Database.Statement {
+		let stmt = this.statements.get(sql);
+		if (!stmt) {
+			stmt = this.db.prepare(sql);
+			this.statements.set(sql, stmt);
+		}
+		return stmt;
 	}
 
-	private async upsertNode(entity: any): Promise<string> {
+	private upsertNode(entity: any): string {
 		const nodeId = this.generateNodeId(entity);
 		const canonical = this.canonicalize(String(entity.name || ''));
 
-		this.db
-			.prepare(
-				`INSERT INTO nodes (node_id, node_type, canonical_name, attributes_json)
-         VALUES (?, ?, ?, ?)
-         ON CONFLICT(node_id) DO UPDATE SET
-         frequency = frequency + 1`
-			)
-			.run(nodeId, entity.type, canonical, JSON.stringify(entity.attributes));
+		this.statement(GRAPH_SQL.upsertNode).run(
+			nodeId,
+			entity.type,
+			canonical,
+			JSON.stringify(entity.attributes)
+		);
 
 		return nodeId;
 	}
 
-	private async upsertMotifNode(motif: any): Promise<string> {
+	private upsertMotifNode(motif: any): string {
 		const nodeId = `motif_${motif.label}`;
 
-		this.db
-			.prepare(
-				`INSERT INTO nodes (node_id, node_type, canonical_name, attributes_json)
-         VALUES (?, 'motif', ?, ?)
-         ON CONFLICT(node_id) DO UPDATE SET
-         frequency = frequency + 1`
-			)
-			.run(nodeId, motif.label, JSON.stringify(motif));
+		this.statement(GRAPH_SQL.upsertMotifNode).run(nodeId, motif.label, JSON.stringify(motif));
 
 		return nodeId;
 	}
 
-	private async upsertEdge(
+	private upsertEdge(
 		fromNode: string,
 		toNode: string,
 		edgeType: string,
-		evidence: unknown
-	): Promise<void> {
+		evidenceJson: string
+	): void {
 		const edgeId = `${fromNode}_${toNode}_${edgeType}`;
 
-		this.db
-			.prepare(
-				`INSERT INTO edges (edge_id, from_node, to_node, edge_type, evidence_json)
-         VALUES (?, ?, ?, ?, ?)
-         ON CONFLICT(edge_id) DO UPDATE SET
-         weight = weight + 1`
-			)
-			.run(edgeId, fromNode, toNode, edgeType, JSON.stringify(evidence));
+		this.statement(GRAPH_SQL.upsertEdge).run(edgeId, fromNode, toNode, edgeType, evidenceJson);
 	}
 
-	private async linkSegmentToNode(
-		segmentId: string,
-		nodeId: string,
-		role: string
-	): Promise<void> {
-		this.db
-			.prepare(
-				`INSERT OR IGNORE INTO segment_node_map (segment_id, node_id, role)
-         VALUES (?, ?, ?)`
-			)
-			.run(segmentId, nodeId, role);
+	private linkSegmentToNode(segmentId: string, nodeId: string, role: string): void {
+		this.statement(GRAPH_SQL.linkSegmentToNode).run(segmentId, nodeId, role);
 	}
 
 	private generateNodeId(entity: any): string {
 		const entityType = String(entity.type || 'unknown');
 		const entityName = String(entity.name || 'unnamed');
-		return `${entityType}_${entityName.toLowerCase().replace(/\s+/g, '_')}`;
+
+		let ids = this.nodeIds.get(entityType);
+		if (!ids) {
+			ids = new Map();
+			this.nodeIds.set(entityType, ids);
+		}
+		return (
+			ids.get(entityName) ??
+			rememberBounded(
+				ids,
+				entityName,
+				`${entityType}_${entityName.toLowerCase().replace(/\s+/g, '_')}`
+			)
+		);
 	}
 
 	private canonicalize(name: string): string {
-		const aliases: Record<string, string> = {
-			tom: 'Thomas',
-			tommy: 'Thomas',
-		};
+		return (
+			this.canonicalNames.get(name) ??
+			rememberBounded(this.canonicalNames, name, NAME_ALIASES.get(name.toLowerCase()) || name)
+		);
+	}
 
-		const lower = name.toLowerCase();
-		return aliases[lower] || name;
+	async updateCentralityMetrics(): Promise<void> {
+		this.db.transaction(() => this.recomputeCentrality())();
 	}
 
-	private async updateCentralityMetrics(): Promise<void> {
-		const query = `
-      UPDATE nodes
-      SET centrality = (
-        SELECT COUNT(*) FROM edges
-        WHERE edges.from_node = nodes.node_id
-        OR edges.to_node = nodes.node_id
-      )
-    `;
+	private recomputeCentrality(): void {
+		const degrees = this.statement(GRAPH_SQL.nodeDegrees).raw().all() as Array<
+			[nodeId: string, degree: number]
+		>;
+
+		const reset = this.statement(GRAPH_SQL.resetCentrality);
+		const update = this.statement(GRAPH_SQL.updateCentrality);
 
-		this.db.prepare(query).run();
+		reset.run();
+		for (const [nodeId, degree] of degrees) {
+			update.run(degree, nodeId);
+		}
 	}
 
 	async checkContinuity(character: string): Promise<any[]> {
-		const query = `
-      SELECT n1.canonical_name, n1.attributes_json as state1,
-             n2.attributes_json as state2, e.evidence_json
-      FROM nodes n1
-      JOIN edges e ON n1.node_id = e.from_node
-      JOIN nodes n2 ON n2.node_id = e.to_node
-      WHERE n1.canonical_name = ?
-      AND n1.node_type = 'character'
-      AND e.edge_type = 'temporal'
-    `;
-
-		const rows = this.db.prepare(query).all(character);
-		return this.detectViolations(rows);
+		const rows = this.statement(GRAPH_SQL.continuityRows).raw().all(character);
+		return this.detectViolations(rows as ContinuityRow[]);
 	}
 
 	private detectViolations(
-		rows: any[]
+		rows: ContinuityRow[]
 	): Array<{ id: string; similarity?: number; [key: string]: unknown }> {
 		const violations = [];
-		for (const row of rows) {
-			const state1 = JSON.parse(row.state1);
-			const state2 = JSON.parse(row.state2);
+		for (const [canonicalName, rawState1, rawState2, evidence] of rows) {
+			const state1 = JSON.parse(rawState1);
+			const state2 = JSON.parse(rawState2);
 
 			// Compare physical and fundamental traits
 			const trackingTraits = ['eye_color', 'hair_color', 'age', 'role', 'dead'];
@@ -833,20 +1257,20 @@ export class NarrativeGraphManager {
 					if (trait === 'age') {
 						if (Number(state2[trait]) < Number(state1[trait])) {
 							violations.push({
-								id: `violation_${row.canonical_name}_age`,
+								id: `violation_${canonicalName}_age`,
 								type: 'continuity_error',
-								entity: row.canonical_name,
+								entity: canonicalName,
 								issue: `Age decreased from ${state1[trait]} to ${state2[trait]}`,
-								evidence: row.evidence_json,
+								evidence,
 							});
 						}
 					} else {
 						violations.push({
-							id: `violation_${row.canonical_name}_${trait}`,
+							id: `violation_${canonicalName}_${trait}`,
 							type: 'continuity_error',
-							entity: row.canonical_name,
+							entity: canonicalName,
 							issue: `Contradictory ${trait}: was ${state1[trait]}, now ${state2[trait]}`,
-							evidence: row.evidence_json,
+							evidence,
 						});
 					}
 				}
@@ -871,7 +1295,11 @@ export class MotifClusteringEngine {
 	}
 
 	async clusterMotifs(embeddings: Float32Array[]): Promise<MotifCluster[]> {
-		const labels = await this.runClustering(embeddings);
+		// Unit-normalize once: cosine becomes a plain dot product, and the
+		// Euclidean distances used for coherence satisfy d^2 = 2 - 2cos, so
+		// they follow the same angular structure the embeddings encode
+		const normalized = embeddings.map((emb) => this.normalize(emb));
+		const labels = await this.runClustering(normalized);
 
 		const clusters: Map<number, number[]> = new Map();
 		labels.forEach((label, idx) => {
@@ -886,7 +1314,7 @@ export class MotifClusteringEngine {
 		const motifClusters: MotifCluster[] = [];
 
 		for (const [clusterId, indices] of clusters) {
-			const clusterEmbeddings = indices.map((i) => embeddings[i]);
+			const clusterEmbeddings = indices.map((i) => normalized[i]);
 			const centroid = this.computeCentroid(clusterEmbeddings);
 			const keywords = await this.extractKeywords(indices);
 			const coherence = this.computeCoherence(clusterEmbeddings, centroid);
@@ -903,6 +1331,10 @@ export class MotifClusteringEngine {
 		return motifClusters;
 	}
 
+	/**
+	 * Leader clustering over unit vectors; leaders are kept normalized so each
+	 * comparison is a single dot product
+	 */
 	private async runClustering(embeddings: Float32Array[]): Promise<number[]> {
 		if (embeddings.length === 0) return [];
 
@@ -914,13 +1346,13 @@ export class MotifClusteringEngine {
 		for (const emb of embeddings) {
 			let foundCluster = -1;
 			for (let i = 0; i < clusters.length; i++) {
-				const similarity = this.computeCosineSimilarity(emb, clusters[i]);
-				if (similarity > threshold) {
+				if (this.dot(emb, clusters[i]) > threshold) {
 					foundCluster = i;
-					// Update centroid (running average)
+					// Update centroid (running average), then restore unit length
 					for (let j = 0; j < emb.length; j++) {
 						clusters[i][j] = (clusters[i][j] + emb[j]) / 2;
 					}
+					clusters[i] = this.normalize(clusters[i]);
 					break;
 				}
 			}
@@ -936,16 +1368,22 @@ export class MotifClusteringEngine {
 		return labels;
 	}
 
-	private computeCosineSimilarity(a: Float32Array, b: Float32Array): number {
+	private dot(a: Float32Array, b: Float32Array): number {
 		let dot = 0;
-		let normA = 0;
-		let normB = 0;
-		for (let i = 0; i < a.length; i++) {
-			dot += a[i] * b[i];
-			normA += a[i] * a[i];
-			normB += b[i] * b[i];
+		for (let i = 0; i < a.length; i++) dot += a[i] * b[i];
+		return dot;
+	}
+
+	private normalize(v: Float32Array): Float32Array {
+		let norm = 0;
+		for (let i = 0; i < v.length; i++) norm += v[i] * v[i];
+		norm = Math.sqrt(norm);
+
+		const unit = new Float32Array(v.length);
+		if (norm > 0) {
+			for (let i = 0; i < v.length; i++) unit[i] = v[i] / norm;
 		}
-		return dot / (Math.sqrt(normA) * Math.sqrt(normB));
+		return unit;
 	}
 
 	private computeCentroid(embeddings: Float32Array[]): Float32Array {
@@ -1007,6 +1445,15 @@ export class MotifClusteringEngine {
 // Main Fractal Narrative Memory System
 // ============================================================================
 
+// Scale weights for each named retrieval policy, looked up rather than branched on
+const RETRIEVAL_POLICIES = {
+	'line-fix': { micro: 0.9, meso: 0.1, macro: 0.0 },
+	'scene-fix': { micro: 0.2, meso: 0.7, macro: 0.1 },
+	thematic: { micro: 0.1, meso: 0.3, macro: 0.8 },
+} as const;
+
+type RetrievalPolicy = keyof typeof RETRIEVAL_POLICIES;
+
 export class FractalNarrativeMemory extends EventEmitter {
 	private segmenter: FractalSegmenter;
 	private retriever: FractalRetriever;
@@ -1016,8 +1463,13 @@ export class FractalNarrativeMemory extends EventEmitter {
 	private logger: ReturnType<typeof getLogger>;
 	private db!: Database.Database;
 	private cache: Map<string, any>;
+	private insertStatements: Map<string, Database.Statement> = new Map();
 
-	constructor(config?: Partial<FractalMemoryConfig>) {
+	/**
+	 * Pass an existing HMS instance to share one embedding engine and store
+	 * instead of loading a second copy
+	 */
+	constructor(config?: Partial<FractalMemoryConfig>, hms?: HolographicMemorySystem) {
 		super();
 		this.logger = getLogger('FractalNarrativeMemory');
 
@@ -1038,7 +1490,7 @@ export class FractalNarrativeMemory extends EventEmitter {
 		};
 
 		this.segmenter = new FractalSegmenter(this.config);
-		this.retriever = new FractalRetriever(this.config);
+		this.retriever = new FractalRetriever(this.config, hms);
 		this.graphManager = new NarrativeGraphManager('./narrative_graph.db');
 		this.motifEngine = new MotifClusteringEngine(this.config.minClusterSize);
 		this.cache = new Map();
@@ -1091,6 +1543,11 @@ export class FractalNarrativeMemory extends EventEmitter {
         embedding_id TEXT,
         arc_type TEXT
       )`);
+
+		// Compile the per-scale inserts before the first ingest needs them
+		for (const sql of Object.values(SEGMENT_INSERT_SQL)) {
+			this.statement(sql);
+		}
 	}
 
 	async ingestDocument(document: ScrivenerDocument): Promise<void> {
@@ -1101,13 +1558,13 @@ export class FractalNarrativeMemory extends EventEmitter {
 			parseInt(String(document.metadata?.chapter || '1'))
 		);
 
-		await this.indexSegments(segments.micro, 'micro');
-		await this.indexSegments(segments.meso, 'meso');
-		await this.indexSegments(segments.macro, 'macro');
+		await this.indexSegments([
+			['micro', segments.micro],
+			['meso', segments.meso],
+			['macro', segments.macro],
+		]);
 
-		for (const meso of segments.meso) {
-			await this.graphManager.updateGraphForSegment(meso);
-		}
+		await this.graphManager.updateGraphForSegments(segments.meso, segments.mentions);
 
 		if (Math.random() < 0.1) {
 			await this.clusterMotifs();
@@ -1116,69 +1573,37 @@ export class FractalNarrativeMemory extends EventEmitter {
 		this.emit('documentIngested', document.id);
 	}
 
+	/**
+	 * Store every scale in one transaction and memorize all texts in one HMS
+	 * batch, so a chapter pays one commit and one IDF rebuild instead of three
+	 */
 	private async indexSegments(
-		segments: Array<MicroSegment | MesoSegment | MacroSegment>,
-		scale: string
+		scales: Array<[SegmentScale, Array<MicroSegment | MesoSegment | MacroSegment>]>
 	): Promise<void> {
-		for (const segment of segments) {
-			await this.storeSegment(segment, scale);
-		}
-		const batchItems = segments.map((s) => ({ id: s.id, text: s.text }));
-		if (batchItems.length > 0) {
-			await this.retriever.memorizeBatch(batchItems);
-		}
+		this.db.transaction(() => {
+			for (const [scale, segments] of scales) {
+				for (const segment of segments) {
+					this.storeSegment(segment, scale);
+				}
+			}
+		})();
+		const batchItems = scales.flatMap(([, segments]) =>
+			segments.map((s) => ({ id: s.id, text: s.text }))
+		);
+		await this.retriever.memorizeBatch(batchItems);
 	}
 
-	private async storeSegment(segment: any, scale: string): Promise<void> {
-		if (scale === 'micro') {
-			this.db
-				.prepare(
-					`INSERT OR REPLACE INTO segments_micro (id, chapter, para_index, sent_index, beat_index, text, start_char, end_char, tokens)
-				VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)`
-				)
-				.run(
-					segment.id,
-					segment.chapter,
-					segment.paraIndex,
-					segment.sentIndex,
-					segment.beatIndex || null,
-					segment.text,
-					segment.startChar,
-					segment.endChar,
-					segment.tokens
-				);
-		} else if (scale === 'meso') {
-			this.db
-				.prepare(
-					`INSERT OR REPLACE INTO segments_meso (id, chapter, start_char, end_char, text, micro_ids, scene_type, tokens)
-				VALUES (?, ?, ?, ?, ?, ?, ?, ?)`
-				)
-				.run(
-					segment.id,
-					segment.chapter,
-					segment.startChar,
-					segment.endChar,
-					segment.text,
-					JSON.stringify(segment.microIds),
-					segment.sceneType,
-					segment.tokens
-				);
-		} else if (scale === 'macro') {
-			this.db
-				.prepare(
-					`INSERT OR REPLACE INTO segments_macro (id, chapter_or_arc, start_char, end_char, text, meso_ids, arc_type)
-				VALUES (?, ?, ?, ?, ?, ?, ?)`
-				)
-				.run(
-					segment.id,
-					segment.chapterOrArc,
-					segment.startChar,
-					segment.endChar,
-					segment.text,
-					JSON.stringify(segment.mesoIds),
-					segment.arcType
-				);
+	private statement(sql: string): Database.Statement {
+		let stmt = this.insertStatements.get(sql);
+		if (!stmt) {
+			stmt = this.db.prepare(sql);
+			this.insertStatements.set(sql, stmt);
 		}
+		return stmt;
+	}
+
+	private storeSegment(segment: AnySegment, scale: SegmentScale): void {
+		this.statement(SEGMENT_INSERT_SQL[scale]).run(segmentCodec(scale).toTuple(segment));
 	}
 
 	async query(
@@ -1186,27 +1611,67 @@ export class FractalNarrativeMemory extends EventEmitter {
 		options?: {
 			k?: number;
 			scaleWeights?: Partial<{ micro: number; meso: number; macro: number }>;
-			policy?: 'line-fix' | 'scene-fix' | 'thematic';
+			policy?: RetrievalPolicy;
 		}
 	): Promise<FractalRetrievalResult[]> {
+		const [results] = await this.queryBatch([queryText], options);
+		return results;
+	}
+
+	/**
+	 * Answer several queries with shared options in one retrieval pass.
+	 * Cached queries are served directly; the rest go out as a single batch.
+	 */
+	async queryBatch(
+		queryTexts: string[],
+		options?: {
+			k?: number;
+			scaleWeights?: Partial<{ micro: number; meso: number; macro: number }>;
+			policy?: RetrievalPolicy;
+		}
+	): Promise<FractalRetrievalResult[][]> {
 		let scaleWeights = options?.scaleWeights || this.config.scaleWeights;
 
 		if (options?.policy) {
 			scaleWeights = this.applyPolicy(options.policy);
 		}
 
-		const cacheKey = `${queryText}_${JSON.stringify(scaleWeights)}_${options?.k || 10}`;
-		if (this.cache.has(cacheKey)) {
-			return this.cache.get(cacheKey);
+		const k = options?.k || 10;
+		const weightsKey = JSON.stringify(scaleWeights);
+		const cacheKeys = queryTexts.map((text) => `${text}_${weightsKey}_${k}`);
+
+		const results: FractalRetrievalResult[][] = new Array(queryTexts.length);
+		const pending = new Map<string, number[]>();
+		cacheKeys.forEach((cacheKey, i) => {
+			if (this.cache.has(cacheKey)) {
+				results[i] = this.cache.get(cacheKey);
+			} else if (pending.has(queryTexts[i])) {
+				pending.get(queryTexts[i])!.push(i);
+			} else {
+				pending.set(queryTexts[i], [i]);
+			}
+		});
+
+		if (pending.size > 0) {
+			const misses = [...pending.keys()];
+			const fetched = await this.retriever.retrieveBatch(
+				misses,
+				k,
+				scaleWeights,
+				this.graphManager.db,
+				this.db
+			);
+			misses.forEach((text, m) => {
+				const indices = pending.get(text)!;
+				this.cacheResults(cacheKeys[indices[0]], fetched[m]);
+				for (const i of indices) results[i] = fetched[m];
+			});
 		}
 
-		const results = await this.retriever.retrieve(
-			queryText,
-			options?.k || 10,
-			scaleWeights,
-			this.graphManager.db
-		);
+		return results;
+	}
 
+	private cacheResults(cacheKey: string, results: FractalRetrievalResult[]): void {
 		this.cache.set(cacheKey, results);
 
 		if (this.cache.size > 100) {
@@ -1215,21 +1680,10 @@ export class FractalNarrativeMemory extends EventEmitter {
 				this.cache.delete(firstKey);
 			}
 		}
-
-		return results;
 	}
 
-	private applyPolicy(policy: 'line-fix' | 'scene-fix' | 'thematic') {
-		switch (policy) {
-			case 'line-fix':
-				return { micro: 0.9, meso: 0.1, macro: 0.0 };
-			case 'scene-fix':
-				return { micro: 0.2, meso: 0.7, macro: 0.1 };
-			case 'thematic':
-				return { micro: 0.1, meso: 0.3, macro: 0.8 };
-			default:
-				return this.config.scaleWeights;
-		}
+	private applyPolicy(policy: RetrievalPolicy) {
+		return RETRIEVAL_POLICIES[policy] || this.config.scaleWeights;
 	}
 
 	async checkContinuity(character: string): Promise<any[]> {
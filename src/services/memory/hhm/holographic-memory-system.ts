@@ -1,4 +1,5 @@
 import { getLogger } from '../../../core/logger.js';
+import { parseEnvBool } from '../../../utils/env-config.js';
 import type { ScrivenerDocument } from '../../../types/index.js';
 import * as path from 'path';
 
@@ -12,6 +13,44 @@ export interface HHMConfig {
 	autoEvolve?: boolean;
 	similarityThreshold?: number;
 	evolution?: Record<string, unknown>;
+	/**
+	 * Storage precision of the JS engine's vectors, also settable through
+	 * SCRIVENER_HMS_PRECISION. float32 (default) halves memory traffic with no
+	 * practical effect on cosine ranking; int8 scalar-quantizes stored vectors
+	 * for another 4x at a small recall cost; float64 keeps full precision.
+	 */
+	precision?: VectorPrecision;
+	/**
+	 * Opt the JS engine into partitioning large stores into IVF lists, also
+	 * settable through SCRIVENER_HMS_IVF. Off by default: IVF search is
+	 * approximate, and the lists are trained on the first query after each
+	 * doubling of the store, which blocks that query.
+	 */
+	ivf?: boolean;
+	/**
+	 * IVF lists scanned per query. Defaults to one eighth of the lists; raise
+	 * it to trade latency for recall.
+	 */
+	ivfProbes?: number;
+}
+
+const VECTOR_PRECISIONS = ['float32', 'float64', 'int8'] as const;
+
+export type VectorPrecision = (typeof VECTOR_PRECISIONS)[number];
+
+/**
+ * Parse a precision setting, warning on unsupported values
+ */
+function parsePrecision(value: string | undefined): VectorPrecision | undefined {
+	if (!value) return undefined;
+
+	const lower = value.toLowerCase().trim();
+	if ((VECTOR_PRECISIONS as readonly string[]).includes(lower)) {
+		return lower as VectorPrecision;
+	}
+
+	logger.warn(`Invalid vector precision: "${value}", using default float32`);
+	return undefined;
 }
 
 export interface MemoryFormationResult {
@@ -44,12 +83,28 @@ export interface ConceptSummary {
 	summary: string;
 }
 
+type Vector = Float32Array | Float64Array;
+type StoredVector = Vector | Int8Array;
+
 interface VectorEntry {
 	id: string;
-	vector: Float64Array;
+	vector: StoredVector;
+	// Multiplier that restores quantized codes to unit scale; 1 for float storage
+	scale: number;
 	text: string;
+	list?: number;
 }
 
+// Inverted-file (IVF) partitioning: once there are enough vectors to train
+// sqrt(N) lists with at least this many points each, queries only scan the
+// lists whose centroids are closest to the query vector
+const IVF_MIN_POINTS_PER_LIST = 39;
+const IVF_MAX_TRAINING_POINTS_PER_LIST = 64;
+const IVF_TRAINING_ITERATIONS = 8;
+
+// Query vectors are cached until the IDF table changes
+const QUERY_VECTOR_CACHE_SIZE = 1024;
+
 const STOP_WORDS = new Set([
 	'the',
 	'a',
@@ -160,6 +215,49 @@ const STOP_WORDS = new Set([
 	'many',
 ]);
 
+/**
+ * The k highest-scoring items, best first. A size-k min-heap keeps the
+ * current leaders, so ranking n candidates costs O(n log k), not a full sort.
+ */
+export function topK<T>(
+	items: Iterable<T>,
+	k: number,
+	score: (item: T) => number
+): Array<{ item: T; score: number }> {
+	const heap: Array<{ item: T; score: number }> = [];
+	if (k <= 0) return heap;
+
+	for (const item of items) {
+		const s = score(item);
+		if (heap.length < k) {
+			// Sift up from the new leaf
+			let i = heap.push({ item, score: s }) - 1;
+			while (i > 0) {
+				const parent = (i - 1) >> 1;
+				if (heap[parent].score <= heap[i].score) break;
+				[heap[parent], heap[i]] = [heap[i], heap[parent]];
+				i = parent;
+			}
+		} else if (s > heap[0].score) {
+			// Replace the weakest leader and sift down
+			heap[0] = { item, score: s };
+			let i = 0;
+			for (;;) {
+				const left = 2 * i + 1;
+				const right = left + 1;
+				let smallest = i;
+				if (left < k && heap[left].score < heap[smallest].score) smallest = left;
+				if (right < k && heap[right].score < heap[smallest].score) smallest = right;
+				if (smallest === i) break;
+				[heap[smallest], heap[i]] = [heap[i], heap[smallest]];
+				i = smallest;
+			}
+		}
+	}
+
+	return heap.sort((a, b) => b.score - a.score);
+}
+
 /**
  * FNV-1a hash. Fast, good distribution, no crypto overhead.
  */
@@ -178,12 +276,52 @@ function fnv1a(str: string): number {
  */
 class JSVectorEngine {
 	private entries: VectorEntry[] = [];
+	private byId: Map<string, VectorEntry> = new Map();
 	private idf: Map<string, number> = new Map();
 	private idfStale = true;
 	private dimensions: number;
-
-	constructor(dimensions: number) {
+	private allocate: (length: number) => Vector;
+	private quantize: boolean;
+	private centroids: Vector[] = [];
+	private lists: VectorEntry[][] = [];
+	private trainedSize = 0;
+	private ivf: boolean;
+	private ivfProbes?: number;
+	private queryVectors: Map<string, Vector> = new Map();
+
+	constructor(
+		dimensions: number,
+		options: { precision?: VectorPrecision; ivf?: boolean; ivfProbes?: number } = {}
+	) {
+		const { precision = 'float32', ivf = false, ivfProbes } = options;
 		this.dimensions = dimensions;
+		this.allocate =
+			precision === 'float64'
+				? (length) => new Float64Array(length)
+				: (length) => new Float32Array(length);
+		this.quantize = precision === 'int8';
+		this.ivf = ivf;
+		this.ivfProbes = ivfProbes;
+	}
+
+	/**
+	 * Convert a unit vector to its stored form. int8 storage keeps one scale
+	 * per vector (max |v| / 127), so similarity is scale * dot(query, codes).
+	 */
+	private toStored(vector: Vector): { vector: StoredVector; scale: number } {
+		if (!this.quantize) return { vector, scale: 1 };
+
+		let maxAbs = 0;
+		for (let i = 0; i < vector.length; i++) {
+			const abs = Math.abs(vector[i]);
+			if (abs > maxAbs) maxAbs = abs;
+		}
+		const codes = new Int8Array(vector.length);
+		if (maxAbs === 0) return { vector: codes, scale: 0 };
+
+		const scale = maxAbs / 127;
+		for (let i = 0; i < vector.length; i++) codes[i] = Math.round(vector[i] / scale);
+		return { vector: codes, scale };
 	}
 
 	private tokenize(text: string): string[] {
@@ -194,24 +332,47 @@ class JSVectorEngine {
 			.filter((w) => w.length > 2 && !STOP_WORDS.has(w));
 	}
 
-	private rebuildIDF(): void {
+	// Pending texts are counted as documents so a batch shares one rebuild
+	private rebuildIDF(pending: string[] = []): void {
 		if (!this.idfStale) return;
-		const docCount = this.entries.length || 1;
+		const docCount = this.entries.length + pending.length || 1;
 		const termDocs = new Map<string, number>();
-		for (const entry of this.entries) {
-			const seen = new Set(this.tokenize(entry.text));
-			for (const term of seen) {
+		const countTerms = (text: string) => {
+			for (const term of new Set(this.tokenize(text))) {
 				termDocs.set(term, (termDocs.get(term) || 0) + 1);
 			}
-		}
+		};
+		for (const entry of this.entries) countTerms(entry.text);
+		for (const text of pending) countTerms(text);
 		this.idf.clear();
 		for (const [term, count] of termDocs) {
 			this.idf.set(term, Math.log((docCount + 1) / (count + 1)) + 1);
 		}
 		this.idfStale = false;
+		this.queryVectors.clear();
+	}
+
+	private queryVector(text: string): Vector {
+		const cached = this.queryVectors.get(text);
+		if (cached) {
+			// Re-insert to mark as most recently used
+			this.queryVectors.delete(text);
+			this.queryVectors.set(text, cached);
+			return cached;
+		}
+
+		const vector = this.textToVector(text);
+		this.queryVectors.set(text, vector);
+		if (this.queryVectors.size > QUERY_VECTOR_CACHE_SIZE) {
+			const oldest = this.queryVectors.keys().next().value;
+			if (oldest !== undefined) {
+				this.queryVectors.delete(oldest);
+			}
+		}
+		return vector;
 	}
 
-	private textToVector(text: string): Float64Array {
+	private textToVector(text: string): Vector {
 		const tokens = this.tokenize(text);
 		const tf = new Map<string, number>();
 		for (const token of tokens) {
@@ -221,7 +382,7 @@ class JSVectorEngine {
 		// Log-normalized TF
 		const maxTf = Math.max(...tf.values(), 1);
 
-		const vec = new Float64Array(this.dimensions);
+		const vec = this.allocate(this.dimensions);
 		for (const [term, count] of tf) {
 			const idfVal = this.idf.get(term) || 1;
 			const weight = (1 + Math.log(count / maxTf + 1)) * idfVal;
@@ -243,30 +404,181 @@ class JSVectorEngine {
 		return vec;
 	}
 
-	private cosine(a: Float64Array, b: Float64Array): number {
+	private cosine(a: StoredVector, b: StoredVector): number {
 		let dot = 0;
 		for (let i = 0; i < a.length; i++) dot += a[i] * b[i];
 		return dot; // Both pre-normalized, so dot = cosine
 	}
 
+	private entrySimilarity(a: VectorEntry, b: VectorEntry): number {
+		return this.cosine(a.vector, b.vector) * a.scale * b.scale;
+	}
+
+	// Argmax is unaffected by a positive scale, so quantized codes work directly
+	private nearestList(vector: StoredVector): number {
+		let best = 0;
+		let bestSim = -Infinity;
+		for (let i = 0; i < this.centroids.length; i++) {
+			const sim = this.cosine(vector, this.centroids[i]);
+			if (sim > bestSim) {
+				bestSim = sim;
+				best = i;
+			}
+		}
+		return best;
+	}
+
+	/**
+	 * Train IVF centroids with spherical k-means on a random sample, then
+	 * assign every entry to its nearest list. Retrains when the store doubles.
+	 */
+	private maybeTrainIVF(): void {
+		if (!this.ivf) return;
+		const size = this.entries.length;
+		if (this.centroids.length > 0 && size < this.trainedSize * 2) return;
+
+		const nlist = Math.floor(Math.sqrt(size));
+		if (size < IVF_MIN_POINTS_PER_LIST * nlist) return;
+
+		// Partial Fisher-Yates shuffle for the training sample
+		const order = Array.from({ length: size }, (_, i) => i);
+		const sampleSize = Math.min(size, nlist * IVF_MAX_TRAINING_POINTS_PER_LIST);
+		for (let i = 0; i < sampleSize; i++) {
+			const j = i + Math.floor(Math.random() * (size - i));
+			[order[i], order[j]] = [order[j], order[i]];
+		}
+		const sample = order.slice(0, sampleSize).map((i) => this.entries[i]);
+
+		this.centroids = sample.slice(0, nlist).map(({ vector, scale }) => {
+			const centroid = this.allocate(vector.length);
+			for (let d = 0; d < vector.length; d++) centroid[d] = vector[d] * scale;
+			return centroid;
+		});
+		for (let iter = 0; iter < IVF_TRAINING_ITERATIONS; iter++) {
+			const sums = this.centroids.map(() => new Float64Array(this.dimensions));
+			for (const { vector, scale } of sample) {
+				const sum = sums[this.nearestList(vector)];
+				for (let d = 0; d < vector.length; d++) sum[d] += vector[d] * scale;
+			}
+			for (let c = 0; c < sums.length; c++) {
+				let norm = 0;
+				for (let d = 0; d < sums[c].length; d++) norm += sums[c][d] * sums[c][d];
+				norm = Math.sqrt(norm);
+				// Empty clusters keep their previous centroid
+				if (norm > 0) {
+					for (let d = 0; d < sums[c].length; d++) {
+						this.centroids[c][d] = sums[c][d] / norm;
+					}
+				}
+			}
+		}
+
+		this.lists = this.centroids.map(() => []);
+		for (const entry of this.entries) {
+			entry.list = this.nearestList(entry.vector);
+			this.lists[entry.list].push(entry);
+		}
+		this.trainedSize = size;
+	}
+
+	private probeLists(queryVec: Vector): VectorEntry[] {
+		const nprobe = Math.min(
+			this.centroids.length,
+			Math.max(1, this.ivfProbes ?? Math.floor(this.centroids.length / 8))
+		);
+		const ranked = this.centroids
+			.map((c, i) => ({ i, sim: this.cosine(queryVec, c) }))
+			.sort((a, b) => b.sim - a.sim);
+
+		const candidates: VectorEntry[] = [];
+		for (let p = 0; p < nprobe; p++) {
+			for (const entry of this.lists[ranked[p].i]) candidates.push(entry);
+		}
+		return candidates;
+	}
+
+	private addEntry(id: string, text: string): void {
+		const entry: VectorEntry = { id, ...this.toStored(this.textToVector(text)), text };
+		if (this.centroids.length > 0) {
+			entry.list = this.nearestList(entry.vector);
+			this.lists[entry.list].push(entry);
+		}
+		this.entries.push(entry);
+		this.byId.set(id, entry);
+	}
+
 	async memorizeText(id: string, text: string): Promise<void> {
-		this.entries = this.entries.filter((e) => e.id !== id);
+		const previous = this.byId.get(id);
+		if (previous) {
+			this.entries = this.entries.filter((e) => e !== previous);
+			if (previous.list !== undefined) {
+				this.lists[previous.list] = this.lists[previous.list].filter((e) => e !== previous);
+			}
+		}
 		this.idfStale = true;
 		this.rebuildIDF();
-		const vector = this.textToVector(text);
-		this.entries.push({ id, vector, text });
+		this.addEntry(id, text);
+	}
+
+	/**
+	 * Memorize many texts with one IDF rebuild and one pass to drop replaced
+	 * entries, instead of paying both per item
+	 */
+	async memorizeBatch(items: Array<{ id: string; text: string }>): Promise<void> {
+		// Later duplicates win, as they would with sequential memorizeText calls
+		const batch = new Map<string, string>();
+		for (const item of items) {
+			batch.delete(item.id);
+			batch.set(item.id, item.text);
+		}
+
+		let replaced = false;
+		for (const id of batch.keys()) {
+			if (this.byId.has(id)) replaced = true;
+		}
+		if (replaced) {
+			const keep = (e: VectorEntry) => !batch.has(e.id);
+			this.entries = this.entries.filter(keep);
+			this.lists = this.lists.map((list) => list.filter(keep));
+		}
+
+		this.idfStale = true;
+		this.rebuildIDF([...batch.values()]);
+		for (const [id, text] of batch) this.addEntry(id, text);
 	}
 
 	async query(text: string, k: number): Promise<Array<{ id: string; similarity: number }>> {
-		if (this.entries.length === 0) return [];
+		const [results] = await this.queryBatch([text], k);
+		return results;
+	}
+
+	/**
+	 * Run several queries against one IDF table and trained index, paying the
+	 * staleness checks once for the whole batch
+	 */
+	async queryBatch(
+		texts: string[],
+		k: number
+	): Promise<Array<Array<{ id: string; similarity: number }>>> {
+		if (this.entries.length === 0) return texts.map(() => []);
 		this.rebuildIDF();
-		const queryVec = this.textToVector(text);
-		const scored = this.entries.map((e) => ({
-			id: e.id,
-			similarity: this.cosine(queryVec, e.vector),
-		}));
-		scored.sort((a, b) => b.similarity - a.similarity);
-		return scored.slice(0, k);
+		this.maybeTrainIVF();
+		return texts.map((text) => this.search(this.queryVector(text), k));
+	}
+
+	private search(queryVec: Vector, k: number): Array<{ id: string; similarity: number }> {
+		const candidates = this.centroids.length > 0 ? this.probeLists(queryVec) : this.entries;
+		return this.rank(candidates, queryVec, k);
+	}
+
+	private rank(
+		candidates: VectorEntry[],
+		queryVec: Vector,
+		k: number
+	): Array<{ id: string; similarity: number }> {
+		return topK(candidates, k, (e) => this.cosine(queryVec, e.vector) * e.scale).map(
+			({ item, score }) => ({ id: item.id, similarity: score })
+		);
 	}
 
 	async findAnalogy(
@@ -278,7 +590,7 @@ class JSVectorEngine {
 		const va = this.textToVector(a);
 		const vb = this.textToVector(b);
 		const vc = this.textToVector(c);
-		const vd = new Float64Array(this.dimensions);
+		const vd = this.allocate(this.dimensions);
 		for (let i = 0; i < this.dimensions; i++) vd[i] = vb[i] - va[i] + vc[i];
 
 		let norm = 0;
@@ -286,12 +598,7 @@ class JSVectorEngine {
 		norm = Math.sqrt(norm);
 		if (norm > 0) for (let i = 0; i < vd.length; i++) vd[i] /= norm;
 
-		const scored = this.entries.map((e) => ({
-			id: e.id,
-			similarity: this.cosine(vd, e.vector),
-		}));
-		scored.sort((a, b) => b.similarity - a.similarity);
-		return scored.slice(0, 10);
+		return this.rank(this.entries, vd, 10);
 	}
 
 	async synthesizeConcepts(): Promise<
@@ -312,7 +619,7 @@ class JSVectorEngine {
 			const distances = this.entries.map((e, i) => {
 				let minDist = Infinity;
 				for (const ci of centroidIndices) {
-					const sim = this.cosine(e.vector, this.entries[ci].vector);
+					const sim = this.entrySimilarity(e, this.entries[ci]);
 					const dist = 1 - sim;
 					if (dist < minDist) minDist = dist;
 				}
@@ -336,7 +643,7 @@ class JSVectorEngine {
 			let bestIdx = 0;
 			let bestSim = -1;
 			for (let i = 0; i < centroidIndices.length; i++) {
-				const sim = this.cosine(entry.vector, this.entries[centroidIndices[i]].vector);
+				const sim = this.entrySimilarity(entry, this.entries[centroidIndices[i]]);
 				if (sim > bestSim) {
 					bestSim = sim;
 					bestIdx = i;
@@ -353,10 +660,10 @@ class JSVectorEngine {
 				let pairs = 0;
 				for (let i = 0; i < Math.min(members.length, 10); i++) {
 					for (let j = i + 1; j < Math.min(members.length, 10); j++) {
-						const ei = this.entries.find((e) => e.id === members[i]);
-						const ej = this.entries.find((e) => e.id === members[j]);
+						const ei = this.byId.get(members[i]);
+						const ej = this.byId.get(members[j]);
 						if (ei && ej) {
-							coherence += this.cosine(ei.vector, ej.vector);
+							coherence += this.entrySimilarity(ei, ej);
 							pairs++;
 						}
 					}
@@ -374,8 +681,13 @@ class JSVectorEngine {
 
 	clear(): void {
 		this.entries = [];
+		this.byId.clear();
 		this.idf.clear();
 		this.idfStale = true;
+		this.centroids = [];
+		this.lists = [];
+		this.trainedSize = 0;
+		this.queryVectors.clear();
 	}
 }
 
@@ -411,7 +723,13 @@ export class HolographicMemorySystem {
 			this.native = new NativeHMS(this.dimensions, storagePath);
 			this.engineType = 'native';
 		} else {
-			this.jsEngine = new JSVectorEngine(Math.min(this.dimensions, 512));
+			const precision =
+				config.precision || parsePrecision(process.env.SCRIVENER_HMS_PRECISION);
+			this.jsEngine = new JSVectorEngine(Math.min(this.dimensions, 512), {
+				precision,
+				ivf: config.ivf ?? parseEnvBool(process.env.SCRIVENER_HMS_IVF, false),
+				ivfProbes: config.ivfProbes,
+			});
 			this.engineType = 'js';
 		}
 
@@ -458,9 +776,7 @@ export class HolographicMemorySystem {
 		if (this.native) {
 			await this.native.memorizeBatch(items, traceId);
 		} else {
-			for (const item of items) {
-				await this.jsEngine!.memorizeText(item.id, item.text);
-			}
+			await this.jsEngine!.memorizeBatch(items);
 		}
 		for (const item of items) {
 			this.memoryIndex.set(item.id, { modality: 'text', originalData: item.text });
@@ -515,6 +831,16 @@ export class HolographicMemorySystem {
 		return this.mapResults(results);
 	}
 
+	async queryTextBatch(texts: string[], k: number = 10): Promise<QueryResult[][]> {
+		if (texts.length === 0) return [];
+		const batches = this.native
+			? await this.native.queryBatch(texts, k)
+			: await this.jsEngine!.queryBatch(texts, k);
+		return batches.map((results: Array<{ id: string; similarity: number }>) =>
+			this.mapResults(results)
+		);
+	}
+
 	async findAnalogy(a: string, b: string, c: string, traceId?: string): Promise<QueryResult[]> {
 		const results = this.native
 			? await this.native.findAnalogy(a, b, c, traceId)
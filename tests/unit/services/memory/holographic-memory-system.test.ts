@@ -0,0 +1,216 @@
+/**
+ * Tests for the JS fallback engine's IVF partitioning and int8 storage
+ */
+
+import { describe, it, expect } from '@jest/globals';
+import { HolographicMemorySystem } from '../../../../src/services/memory/hhm/holographic-memory-system';
+
+const TOPICS = 40;
+const K = 10;
+
+// Seeded PRNG so the corpus is the same on every run
+function mulberry32(seed: number): () => number {
+	return () => {
+		seed = (seed + 0x6d2b79f5) | 0;
+		let t = Math.imul(seed ^ (seed >>> 15), 1 | seed);
+		t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+		return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+	};
+}
+
+/**
+ * Documents drawn from topic vocabularies plus a shared pool, and short
+ * queries over one topic each
+ */
+function syntheticCorpus(size: number, seed = 42) {
+	const random = mulberry32(seed);
+	const pick = (words: string[]) => words[Math.floor(random() * words.length)];
+	const vocab = Array.from({ length: TOPICS }, (_, t) =>
+		Array.from({ length: 12 }, (_, j) => `topic${t}term${j}`)
+	);
+	const shared = Array.from({ length: 50 }, (_, j) => `shared${j}`);
+
+	const docs = Array.from({ length: size }, (_, i) => {
+		const words = [];
+		for (let j = 0; j < 8; j++) words.push(pick(vocab[i % TOPICS]));
+		for (let j = 0; j < 2; j++) words.push(pick(shared));
+		return { id: `doc_${i}`, text: words.join(' ') };
+	});
+	const queries = Array.from({ length: 20 }, (_, q) => {
+		const words = vocab[(q * 7) % TOPICS];
+		return [pick(words), pick(words), pick(words)].join(' ');
+	});
+	return { docs, queries };
+}
+
+function engineOf(hms: HolographicMemorySystem): any {
+	return (hms as any).jsEngine;
+}
+
+// Fraction of each exact top-k list that also appears in the candidate list
+function overlap(candidate: Array<Array<{ id: string }>>, exact: Array<Array<{ id: string }>>) {
+	let hits = 0;
+	let total = 0;
+	for (let q = 0; q < exact.length; q++) {
+		const expected = new Set(exact[q].map((r) => r.id));
+		hits += candidate[q].filter((r) => expected.has(r.id)).length;
+		total += exact[q].length;
+	}
+	return hits / total;
+}
+
+describe('HolographicMemorySystem IVF search', () => {
+	// sqrt(N) lists need at least 39 points each, so IVF starts near 1.5k vectors
+	const { docs, queries } = syntheticCorpus(2000);
+
+	it('keeps top-k recall close to the exact flat scan, which stays the default', async () => {
+		const ivf = new HolographicMemorySystem({ ivf: true });
+		const flat = new HolographicMemorySystem();
+		await ivf.memorizeBatch(docs);
+		await flat.memorizeBatch(docs);
+
+		const approximate = await ivf.queryTextBatch(queries, K);
+		const exact = await flat.queryTextBatch(queries, K);
+
+		expect(engineOf(ivf).centroids.length).toBeGreaterThan(0);
+		expect(engineOf(flat).centroids.length).toBe(0);
+
+		expect(overlap(approximate, exact)).toBeGreaterThanOrEqual(0.9);
+	});
+
+	it('matches the flat scan when every list is probed', async () => {
+		const ivf = new HolographicMemorySystem({ ivf: true, ivfProbes: Number.MAX_SAFE_INTEGER });
+		const flat = new HolographicMemorySystem({ ivf: false });
+		await ivf.memorizeBatch(docs);
+		await flat.memorizeBatch(docs);
+
+		const approximate = await ivf.queryTextBatch(queries, K);
+		const exact = await flat.queryTextBatch(queries, K);
+
+		// Ties may order ids differently, so compare the scores
+		for (let q = 0; q < queries.length; q++) {
+			approximate[q].forEach((r, i) =>
+				expect(r.similarity).toBeCloseTo(exact[q][i].similarity, 5)
+			);
+		}
+	});
+
+	it('assigns every vector to exactly one list', async () => {
+		const hms = new HolographicMemorySystem({ ivf: true });
+		await hms.memorizeBatch(docs);
+		await hms.queryText(queries[0], K);
+
+		const engine = engineOf(hms);
+		const listed = engine.lists.flat().map((e: { id: string }) => e.id);
+		expect(engine.lists.length).toBe(Math.floor(Math.sqrt(docs.length)));
+		expect(listed.sort()).toEqual(docs.map((d) => d.id).sort());
+	});
+
+	it('moves replaced entries between lists without duplicates', async () => {
+		const hms = new HolographicMemorySystem({ ivf: true });
+		await hms.memorizeBatch(docs);
+		await hms.queryText(queries[0], K);
+
+		await hms.memorizeText('unique phrasing about lighthouses', 'doc_0');
+		await hms.memorizeBatch([{ id: 'doc_1', text: 'unique phrasing about volcanoes' }]);
+
+		const engine = engineOf(hms);
+		const listed: string[] = engine.lists.flat().map((e: { id: string }) => e.id);
+		expect(listed.filter((id) => id === 'doc_0')).toHaveLength(1);
+		expect(listed.filter((id) => id === 'doc_1')).toHaveLength(1);
+		expect(listed).toHaveLength(docs.length);
+
+		const [lighthouse] = await hms.queryText('unique phrasing about lighthouses', 1);
+		const [volcano] = await hms.queryText('unique phrasing about volcanoes', 1);
+		expect(lighthouse.id).toBe('doc_0');
+		expect(volcano.id).toBe('doc_1');
+	});
+
+	it('retrains once the store has doubled', async () => {
+		const hms = new HolographicMemorySystem({ ivf: true });
+		await hms.memorizeBatch(docs);
+		await hms.queryText(queries[0], K);
+		const engine = engineOf(hms);
+		expect(engine.trainedSize).toBe(docs.length);
+
+		// Growing by less than 2x keeps the trained lists
+		const more = syntheticCorpus(docs.length * 2, 7).docs.map((d) => ({
+			id: `more_${d.id}`,
+			text: d.text,
+		}));
+		await hms.memorizeBatch(more.slice(0, docs.length / 2));
+		await hms.queryText(queries[0], K);
+		expect(engine.trainedSize).toBe(docs.length);
+
+		await hms.memorizeBatch(more.slice(docs.length / 2, docs.length));
+		await hms.queryText(queries[0], K);
+		expect(engine.trainedSize).toBe(docs.length * 2);
+		expect(engine.lists.length).toBe(Math.floor(Math.sqrt(docs.length * 2)));
+	});
+});
+
+describe('HolographicMemorySystem int8 storage', () => {
+	const { docs, queries } = syntheticCorpus(2000);
+	// Only stop words and short tokens, so it embeds to the zero vector
+	const empty = { id: 'empty', text: 'it is of the' };
+
+	it('ranks close to float32 storage', async () => {
+		const quantized = new HolographicMemorySystem({ precision: 'int8' });
+		const float = new HolographicMemorySystem({ precision: 'float32' });
+		await quantized.memorizeBatch(docs);
+		await float.memorizeBatch(docs);
+
+		const approximate = await quantized.queryTextBatch(queries, K);
+		const exact = await float.queryTextBatch(queries, K);
+
+		expect(overlap(approximate, exact)).toBeGreaterThanOrEqual(0.9);
+		for (let q = 0; q < queries.length; q++) {
+			approximate[q].forEach((r, i) =>
+				expect(Math.abs(r.similarity - exact[q][i].similarity)).toBeLessThan(0.01)
+			);
+		}
+	});
+
+	it('stores a zero vector with zero scale and scores it as zero', async () => {
+		const hms = new HolographicMemorySystem({ precision: 'int8' });
+		await hms.memorizeBatch([empty, { id: 'lighthouse', text: 'lighthouse keeper' }]);
+
+		const entry = engineOf(hms).byId.get('empty');
+		expect(entry.vector).toBeInstanceOf(Int8Array);
+		expect(entry.scale).toBe(0);
+
+		const results = await hms.queryText('lighthouse keeper', 2);
+		expect(results.map((r) => r.id)).toEqual(['lighthouse', 'empty']);
+		expect(results[1].similarity).toBeCloseTo(0, 10);
+	});
+
+	it('assigns quantized codes to float centroids under IVF', async () => {
+		const quantized = new HolographicMemorySystem({ precision: 'int8', ivf: true });
+		const everyList = new HolographicMemorySystem({
+			precision: 'int8',
+			ivf: true,
+			ivfProbes: Number.MAX_SAFE_INTEGER,
+		});
+		const float = new HolographicMemorySystem({ precision: 'float32' });
+		for (const hms of [quantized, everyList, float]) {
+			await hms.memorizeBatch([...docs, empty]);
+		}
+
+		const approximate = await quantized.queryTextBatch(queries, K);
+		const probed = await everyList.queryTextBatch(queries, K);
+		const exact = await float.queryTextBatch(queries, K);
+
+		const engine = engineOf(quantized);
+		expect(engine.centroids[0]).toBeInstanceOf(Float32Array);
+		const listed = engine.lists.flat().map((e: { id: string }) => e.id);
+		expect(listed.sort()).toEqual([...docs.map((d) => d.id), empty.id].sort());
+
+		expect(overlap(approximate, exact)).toBeGreaterThanOrEqual(0.85);
+		for (let q = 0; q < queries.length; q++) {
+			probed[q].forEach((r, i) => {
+				expect(Number.isFinite(r.similarity)).toBe(true);
+				expect(Math.abs(r.similarity - exact[q][i].similarity)).toBeLessThan(0.01);
+			});
+		}
+	});
+});